@@ -1,12 +1,28 @@
 from fastapi import FastAPI, HTTPException, Query, Depends
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, ForeignKey, func, UniqueConstraint
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.exc import IntegrityError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, and_, bindparam, case, event, func, insert, or_, select, update as sql_update, UniqueConstraint
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
+import os
+import orjson
+import redis.asyncio as redis
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with ENGINE.begin() as conn:
+        await conn.run_sync(create_schema)
+    yield
+    # aiosqlite connections run on non-daemon threads; pooled ones would keep the process from exiting
+    await ENGINE.dispose()
+    await REDIS.aclose()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,8 +35,35 @@ app.add_middleware(
 )
 
 # DB Setup
-ENGINE = create_engine("sqlite:///campus.db", echo=True)
-Session = sessionmaker(bind=ENGINE)
+# Pool sized for bursty traffic; for a Postgres deployment also pass pool_recycle=3600
+# so idle connections are replaced before the server drops them.
+ENGINE = create_async_engine(
+    "sqlite+aiosqlite:///campus.db",
+    connect_args={"check_same_thread": False},
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    echo=False,
+)
+AsyncSessionLocal = async_sessionmaker(ENGINE, expire_on_commit=False)
+
+# WAL lets readers run alongside a writer; synchronous=NORMAL drops the per-commit fsync
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+    "temp_store=MEMORY",
+)
+
+@event.listens_for(ENGINE.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_conn, _):
+    cursor = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
 Base = declarative_base()
 
 class College(Base):
@@ -44,19 +87,136 @@ class Event(Base):
     college_id = Column(Integer, ForeignKey("colleges.id"))
     cancelled = Column(Boolean, default=False)
 
+    # lazy="raise" turns an accidental per-row lazy load (N+1) into an error; callers that need these
+    # must ask for them, e.g. select(Event).options(joinedload(Event.college), selectinload(Event.registrations))
+    college = relationship("College", lazy="raise")
+    registrations = relationship("Registration", back_populates="event", lazy="raise")
+
+    __table_args__ = (Index('ix_events_college_cancelled', 'college_id', 'cancelled'),)
+
 class Registration(Base):
     __tablename__ = "registrations"
     id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey("students.id"))
     event_id = Column(Integer, ForeignKey("events.id"))
-    registered_at = Column(DateTime, default=datetime.utcnow)
+    # Stamped by SQLite; the insert-time default also covers databases created before server_default existed
+    registered_at = Column(DateTime, default=func.now(), server_default=func.now())
     attended = Column(Boolean, default=False)
     attended_at = Column(DateTime, nullable=True)
     feedback_rating = Column(Integer, nullable=True)  # 1-5
 
-    __table_args__ = (UniqueConstraint('student_id', 'event_id'),)
-
-Base.metadata.create_all(ENGINE)
+    event = relationship("Event", back_populates="registrations", lazy="raise")
+
+    __table_args__ = (
+        UniqueConstraint('student_id', 'event_id'),
+        Index('ix_reg_event_attended', 'event_id', 'attended'),
+        Index('ix_reg_student_attended', 'student_id', 'attended'),
+        # Partial index: only rated registrations, so it stays small and covers rating averages
+        Index('ix_reg_event_rating_nonnull', 'event_id', 'feedback_rating', sqlite_where=feedback_rating.isnot(None)),
+    )
+
+# Hot-path statements built once; per-request values are supplied as bind parameters
+# All three aggregates share one pass over the event's registrations; FILTER keeps unrated rows out of AVG
+EVENT_REPORT_STMT = select(
+    func.count(Registration.id),
+    func.sum(case((Registration.attended == True, 1), else_=0)),
+    func.avg(Registration.feedback_rating).filter(Registration.feedback_rating.isnot(None)),
+).where(Registration.event_id == bindparam("event_id"))
+
+STUDENT_PARTICIPATION_STMT = select(func.count(Registration.event_id)) \
+    .where(Registration.student_id == bindparam("student_id"), Registration.attended == True)
+
+CANCEL_EVENT_STMT = sql_update(Event) \
+    .where(Event.id == bindparam("event_id")) \
+    .values(cancelled=bindparam("cancelled_value")) \
+    .returning(Event)
+
+# attended_at is only stamped when marking attendance; clearing it keeps the previous time
+MARK_ATTENDANCE_STMT = sql_update(Registration) \
+    .where(Registration.id == bindparam("reg_id")) \
+    .values(
+        attended=bindparam("attended_value", type_=Boolean),
+        attended_at=case((bindparam("attended_value", type_=Boolean), func.now()), else_=Registration.attended_at),
+    ) \
+    .returning(Registration)
+
+FEEDBACK_STMT = sql_update(Registration) \
+    .where(Registration.id == bindparam("reg_id"), Registration.attended == True) \
+    .values(feedback_rating=bindparam("rating")) \
+    .returning(Registration)
+
+DEBUG_EVENTS_STMT = select(Event.id, Event.name, Event.type, Event.college_id, Event.cancelled).order_by(Event.id)
+DEBUG_STUDENTS_STMT = select(Student.id, Student.name, Student.email, Student.college_id).order_by(Student.id)
+DEBUG_REGISTRATIONS_STMT = select(
+    Registration.id, Registration.student_id, Registration.event_id, Registration.attended, Registration.feedback_rating
+).order_by(Registration.id)
+
+def create_schema(conn):
+    Base.metadata.create_all(conn)
+    # create_all skips tables that already exist, so indexes added later must be created separately
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+async def get_db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+def stream_ndjson(stmt):
+    # The generator owns its session: dependency sessions are closed before a streamed body is sent
+    async def rows():
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=1000))
+            async for row in result:
+                yield orjson.dumps(dict(row._mapping)) + b"\n"
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+# Report cache (cache-aside). Redis being unavailable or unresponsive only disables caching:
+# both timeouts make a stuck server raise RedisError instead of blocking the request.
+REDIS = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"), socket_connect_timeout=1, socket_timeout=0.5)
+REPORT_CACHE_TTL = 30  # seconds
+POPULARITY_GENERATION_KEY = "rpt:popularity:gen"
+
+def event_report_key(event_id: int) -> str:
+    return f"rpt:evt:{event_id}"
+
+async def popularity_key(field: str) -> Optional[str]:
+    # Keys embed a generation that every write bumps, so older results are never read again and simply expire
+    try:
+        generation = await REDIS.get(POPULARITY_GENERATION_KEY)
+    except redis.RedisError:
+        return None
+    return f"rpt:popularity:{int(generation or 0)}:{field}"
+
+async def cache_get(key: str):
+    try:
+        cached = await REDIS.get(key)
+    except redis.RedisError:
+        return None
+    return orjson.loads(cached) if cached else None
+
+async def cache_set(key: str, payload):
+    try:
+        await REDIS.set(key, orjson.dumps(payload), ex=REPORT_CACHE_TTL)
+    except redis.RedisError:
+        pass
+
+# In-process memo in front of Redis for the popularity report. Keys carry REGISTRATIONS_VERSION, which
+# every write bumps, so this worker's stale entries are never hit again; other workers age out via the TTL.
+POPULARITY_MEMO = TTLCache(maxsize=256, ttl=15)
+REGISTRATIONS_VERSION = 0
+
+async def invalidate_reports(*event_ids: int):
+    global REGISTRATIONS_VERSION
+    REGISTRATIONS_VERSION += 1
+    try:
+        async with REDIS.pipeline() as pipe:
+            pipe.incr(POPULARITY_GENERATION_KEY)
+            if event_ids:
+                pipe.delete(*(event_report_key(e) for e in event_ids))
+            await pipe.execute()
+    except redis.RedisError:
+        pass
 
 # Pydantic Models
 class EventCreate(BaseModel):
@@ -102,173 +262,195 @@ def get_current_admin():
 
 # Admin Endpoints (Protected in real app)
 @app.post("/events", response_model=EventResponse)
-def create_event(event: EventCreate, current_admin: dict = Depends(get_current_admin)):
-    with Session() as session:
-        db_event = Event(**event.dict())
-        session.add(db_event)
-        session.commit()
-        session.refresh(db_event)
-        return db_event
-
-@app.get("/events", response_model=List[EventResponse])
-def list_events(college_id: Optional[int] = Query(None), current_admin: dict = Depends(get_current_admin)):
-    with Session() as session:
-        query = session.query(Event)
-        if college_id:
-            query = query.filter(Event.college_id == college_id)
-        events = query.all()
-        return events
+async def create_event(event: EventCreate, current_admin: dict = Depends(get_current_admin), db: AsyncSession = Depends(get_db)):
+    db_event = (await db.execute(insert(Event).returning(Event), event.model_dump())).scalar_one()
+    await db.commit()
+    await invalidate_reports(db_event.id)
+    return db_event
+
+# Read endpoints return ORJSONResponse directly: rows come straight from the DB, so response_model
+# validation and jsonable_encoder would only repeat work. The schema stays documented via responses=.
+@app.get("/events", responses={200: {"model": List[EventResponse]}})
+async def list_events(college_id: Optional[int] = Query(None), limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), current_admin: dict = Depends(get_current_admin), db: AsyncSession = Depends(get_db)):
+    stmt = select(Event.id, Event.name, Event.type, Event.date, Event.college_id, Event.cancelled)
+    if college_id:
+        stmt = stmt.where(Event.college_id == college_id)
+    rows = (await db.execute(stmt.order_by(Event.id).limit(limit).offset(offset))).all()
+    return ORJSONResponse([dict(r._mapping) for r in rows])
 
 @app.patch("/events/{event_id}", response_model=EventResponse)
-def update_event_cancelled(event_id: int, update: CancelEvent, current_admin: dict = Depends(get_current_admin)):
-    with Session() as session:
-        db_event = session.query(Event).filter(Event.id == event_id).first()
-        if not db_event:
-            raise HTTPException(404, "Event not found")
-        db_event.cancelled = update.cancelled
-        session.commit()
-        session.refresh(db_event)
-        return db_event
+async def update_event_cancelled(event_id: int, update: CancelEvent, current_admin: dict = Depends(get_current_admin), db: AsyncSession = Depends(get_db)):
+    db_event = (await db.execute(CANCEL_EVENT_STMT, {"event_id": event_id, "cancelled_value": update.cancelled})).scalar_one_or_none()
+    if not db_event:
+        raise HTTPException(404, "Event not found")
+    await db.commit()
+    await invalidate_reports()
+    return db_event
 
 # Student/Other Endpoints (No auth for prototype)
 @app.post("/registrations", response_model=RegistrationResponse)
-def register_student(reg: RegistrationCreate):
-    with Session() as session:
-        db_reg = Registration(**reg.dict())
-        session.add(db_reg)
-        try:
-            session.commit()
-            session.refresh(db_reg)
-            return db_reg
-        except IntegrityError:
-            raise HTTPException(409, "Duplicate registration")
+async def register_student(reg: RegistrationCreate, db: AsyncSession = Depends(get_db)):
+    stmt = sqlite_insert(Registration).values(**reg.model_dump()) \
+        .on_conflict_do_nothing(index_elements=['student_id', 'event_id']) \
+        .returning(Registration)
+    db_reg = (await db.execute(stmt)).scalar_one_or_none()
+    if not db_reg:
+        raise HTTPException(409, "Duplicate registration")
+    await db.commit()
+    await invalidate_reports(db_reg.event_id)
+    return db_reg
 
 @app.patch("/registrations/{reg_id}", response_model=RegistrationResponse)
-def mark_attendance(reg_id: int, update: AttendanceUpdate):
-    with Session() as session:
-        db_reg = session.query(Registration).filter(Registration.id == reg_id).first()
-        if not db_reg:
-            raise HTTPException(404, "Registration not found")
-        db_reg.attended = update.attended
-        if update.attended:
-            db_reg.attended_at = datetime.utcnow()
-        session.commit()
-        session.refresh(db_reg)
-        return db_reg
+async def mark_attendance(reg_id: int, update: AttendanceUpdate, db: AsyncSession = Depends(get_db)):
+    db_reg = (await db.execute(MARK_ATTENDANCE_STMT, {"reg_id": reg_id, "attended_value": update.attended})).scalar_one_or_none()
+    if not db_reg:
+        raise HTTPException(404, "Registration not found")
+    await db.commit()
+    await invalidate_reports(db_reg.event_id)
+    return db_reg
 
 @app.patch("/registrations/{reg_id}/feedback", response_model=RegistrationResponse)
-def collect_feedback(reg_id: int, update: FeedbackUpdate):
+async def collect_feedback(reg_id: int, update: FeedbackUpdate, db: AsyncSession = Depends(get_db)):
     if not 1 <= update.rating <= 5:
         raise HTTPException(400, "Rating must be 1-5")
-    with Session() as session:
-        db_reg = session.query(Registration).filter(Registration.id == reg_id).first()
-        if not db_reg:
+    db_reg = (await db.execute(FEEDBACK_STMT, {"reg_id": reg_id, "rating": update.rating})).scalar_one_or_none()
+    if not db_reg:
+        # Nothing updated: only look the row up to tell a missing registration from a non-attended one
+        if not await db.get(Registration, reg_id):
             raise HTTPException(404, "Registration not found")
-        if not db_reg.attended:
-            raise HTTPException(400, "Cannot feedback without attendance")
-        db_reg.feedback_rating = update.rating
-        session.commit()
-        session.refresh(db_reg)
-        return db_reg
+        raise HTTPException(400, "Cannot feedback without attendance")
+    await db.commit()
+    await invalidate_reports(db_reg.event_id)
+    return db_reg
 
 # Reports (Accessible to admins/students as per needs)
 @app.get("/reports/event/{event_id}")
-def event_report(event_id: int):
-    with Session() as session:
-        total_regs = session.query(func.count(Registration.id)).filter(Registration.event_id == event_id).scalar()
-        attended = session.query(func.count(Registration.id)).filter(Registration.event_id == event_id, Registration.attended == True).scalar()
-        avg_feedback = session.query(func.avg(Registration.feedback_rating)).filter(Registration.event_id == event_id, Registration.feedback_rating != None).scalar() or 0
-        attendance_pct = (attended / total_regs * 100) if total_regs > 0 else 0
-        return {
-            "total_registrations": total_regs,
-            "attendance_percentage": attendance_pct,
-            "average_feedback": avg_feedback
-        }
+async def event_report(event_id: int, db: AsyncSession = Depends(get_db)):
+    key = event_report_key(event_id)
+    cached = await cache_get(key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+    total_regs, attended, avg_feedback = (await db.execute(EVENT_REPORT_STMT, {"event_id": event_id})).one()
+    attended = attended or 0
+    avg_feedback = avg_feedback or 0
+    attendance_pct = (attended / total_regs * 100) if total_regs > 0 else 0
+    payload = {
+        "total_registrations": total_regs,
+        "attendance_percentage": attendance_pct,
+        "average_feedback": avg_feedback
+    }
+    await cache_set(key, payload)
+    return ORJSONResponse(payload)
+
+def event_registrations_stmt(type: Optional[str], college_id: Optional[int]):
+    stmt = select(Event.id.label("event_id"), Event.name, func.count(Registration.id).label("registrations")) \
+        .outerjoin(Registration, Registration.event_id == Event.id) \
+        .where(Event.cancelled == False)
+    if type:
+        stmt = stmt.where(Event.type == type)
+    if college_id:
+        stmt = stmt.where(Event.college_id == college_id)
+    return stmt.group_by(Event.id)
 
 @app.get("/reports/event-popularity")
-def event_popularity(type: Optional[str] = Query(None), college_id: Optional[int] = Query(None)):
-    with Session() as session:
-        query = session.query(Event.id, Event.name, func.count(Registration.id).label("regs")) \
-            .outerjoin(Registration, Registration.event_id == Event.id) \
-            .filter(Event.cancelled == False)
-        if type:
-            query = query.filter(Event.type == type)
-        if college_id:
-            query = query.filter(Event.college_id == college_id)
-        results = query.group_by(Event.id).order_by(func.count(Registration.id).desc()).all()
-        return [{"event_id": r[0], "name": r[1], "registrations": r[2]} for r in results]
+async def event_popularity(
+    type: Optional[str] = Query(None),
+    college_id: Optional[int] = Query(None),
+    order: Literal["none", "popular"] = Query("popular", description="'popular' sorts by registrations, 'none' by event_id"),
+    limit: int = Query(50, ge=1, le=500),
+    after_registrations: Optional[int] = Query(None, description="Keyset cursor: registrations of the last event on the previous page (order=popular, requires after_id)"),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: event_id of the last event on the previous page"),
+    db: AsyncSession = Depends(get_db),
+):
+    if order == "popular" and (after_registrations is None) != (after_id is None):
+        raise HTTPException(400, "after_registrations and after_id must be given together")
+    memo_key = (REGISTRATIONS_VERSION, type, college_id, order, limit, after_registrations, after_id)
+    payload = POPULARITY_MEMO.get(memo_key)
+    if payload is not None:
+        return ORJSONResponse(payload)
+    key = await popularity_key(f"{type}:{college_id}:{order}:{limit}:{after_registrations}:{after_id}")
+    cached = await cache_get(key) if key else None
+    if cached is not None:
+        POPULARITY_MEMO[memo_key] = cached
+        return ORJSONResponse(cached)
+    stmt = event_registrations_stmt(type, college_id)
+    if order == "popular":
+        regs = func.count(Registration.id)
+        if after_registrations is not None and after_id is not None:
+            # Keyset pagination: resume after the (registrations, event_id) pair instead of skipping rows with OFFSET
+            stmt = stmt.having(or_(regs < after_registrations, and_(regs == after_registrations, Event.id > after_id)))
+        stmt = stmt.order_by(regs.desc(), Event.id)
+    else:
+        if after_id is not None:
+            stmt = stmt.where(Event.id > after_id)
+        stmt = stmt.order_by(Event.id)
+    results = (await db.execute(stmt.limit(limit))).all()
+    payload = [dict(r._mapping) for r in results]
+    POPULARITY_MEMO[memo_key] = payload
+    if key:
+        await cache_set(key, payload)
+    return ORJSONResponse(payload)
 
 @app.get("/reports/student-participation/{student_id}")
-def student_participation(student_id: int):
-    with Session() as session:
-        attended_events = session.query(func.count(Registration.event_id)).filter(Registration.student_id == student_id, Registration.attended == True).scalar()
-        return {"attended_events": attended_events}
+async def student_participation(student_id: int, db: AsyncSession = Depends(get_db)):
+    attended_events = await db.scalar(STUDENT_PARTICIPATION_STMT, {"student_id": student_id})
+    return ORJSONResponse({"attended_events": attended_events})
 
 # Bonus
 @app.get("/reports/top-active-students")
-def top_active_students(college_id: Optional[int] = Query(None)):
-    with Session() as session:
-        query = session.query(Student.id, Student.name, func.count(Registration.id).label("attendances")) \
-            .join(Registration, Registration.student_id == Student.id) \
-            .filter(Registration.attended == True)
-        if college_id:
-            query = query.filter(Student.college_id == college_id)
-        results = query.group_by(Student.id).order_by(func.count(Registration.id).desc()).limit(3).all()
-        return [{"student_id": r[0], "name": r[1], "attendances": r[2]} for r in results]
-
-@app.get("/reports/events")
-def flexible_events(type: Optional[str] = Query(None), college_id: Optional[int] = Query(None)):
-    with Session() as session:
-        query = session.query(Event.id, Event.name, func.count(Registration.id).label("regs")) \
-            .outerjoin(Registration, Registration.event_id == Event.id) \
-            .filter(Event.cancelled == False)
-        if type:
-            query = query.filter(Event.type == type)
-        if college_id:
-            query = query.filter(Event.college_id == college_id)
-        results = query.group_by(Event.id).all()
-        return [{"event_id": r[0], "name": r[1], "registrations": r[2]} for r in results]
+async def top_active_students(college_id: Optional[int] = Query(None), db: AsyncSession = Depends(get_db)):
+    stmt = select(Student.id, Student.name, func.count(Registration.id).label("attendances")) \
+        .join(Registration, Registration.student_id == Student.id) \
+        .where(Registration.attended == True)
+    if college_id:
+        stmt = stmt.where(Student.college_id == college_id)
+    results = (await db.execute(stmt.group_by(Student.id).order_by(func.count(Registration.id).desc()).limit(3))).all()
+    return ORJSONResponse([{"student_id": r[0], "name": r[1], "attendances": r[2]} for r in results])
+
+@app.get("/reports/events", deprecated=True)
+async def flexible_events(
+    type: Optional[str] = Query(None),
+    college_id: Optional[int] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: event_id of the last event on the previous page"),
+    db: AsyncSession = Depends(get_db),
+):
+    # Deprecated alias for /reports/event-popularity?order=none; goes through the same memo and Redis cache
+    return await event_popularity(type=type, college_id=college_id, order="none", limit=limit, after_registrations=None, after_id=after_id, db=db)
 
 # For testing, add some seed data endpoint (optional)
 @app.post("/seed")
-def seed_data():
-    with Session() as session:
-        # Add sample data
-        college = College(name="Sample College")
-        session.add(college)
-        session.commit()
-        session.refresh(college)
-        student1 = Student(name="Alice", email="alice@example.com", college_id=college.id)
-        student2 = Student(name="Bob", email="bob@example.com", college_id=college.id)
-        session.add_all([student1, student2])
-        session.commit()
-        session.refresh(student1)
-        session.refresh(student2)
-        event1 = Event(name="Hackathon", type="Workshop", date=datetime(2025, 9, 7), college_id=college.id)
-        event2 = Event(name="Tech Fest", type="Fest", date=datetime(2025, 9, 8), college_id=college.id)
-        session.add_all([event1, event2])
-        session.commit()
-        session.refresh(event1)
-        session.refresh(event2)
-        reg1 = Registration(student_id=student1.id, event_id=event1.id, attended=True)
-        reg2 = Registration(student_id=student2.id, event_id=event1.id, attended=True)
-        reg3 = Registration(student_id=student1.id, event_id=event2.id, attended=True)
-        session.add_all([reg1, reg2, reg3])
-        session.commit()
-        return {"message": "Seeded"}
+async def seed_data(db: AsyncSession = Depends(get_db)):
+    # Add sample data in one transaction; bulk INSERT ... RETURNING hands back the new ids in parameter order
+    async with db.begin():
+        college_id = (await db.execute(insert(College).returning(College.id), {"name": "Sample College"})).scalar_one()
+        student_ids = (await db.execute(insert(Student).returning(Student.id, sort_by_parameter_order=True), [
+            {"name": "Alice", "email": "alice@example.com", "college_id": college_id},
+            {"name": "Bob", "email": "bob@example.com", "college_id": college_id},
+        ])).scalars().all()
+        event_ids = (await db.execute(insert(Event).returning(Event.id, sort_by_parameter_order=True), [
+            {"name": "Hackathon", "type": "Workshop", "date": datetime(2025, 9, 7), "college_id": college_id},
+            {"name": "Tech Fest", "type": "Fest", "date": datetime(2025, 9, 8), "college_id": college_id},
+        ])).scalars().all()
+        await db.execute(insert(Registration), [
+            {"student_id": student_ids[0], "event_id": event_ids[0], "attended": True},
+            {"student_id": student_ids[1], "event_id": event_ids[0], "attended": True},
+            {"student_id": student_ids[0], "event_id": event_ids[1], "attended": True},
+        ])
+    await invalidate_reports(*event_ids)
+    return {"message": "Seeded"}
 
 # Debug endpoints (optional, for testing)
 @app.get("/debug/events")
-def list_events_debug():
-    with Session() as session:
-        return [{"id": e.id, "name": e.name, "type": e.type, "college_id": e.college_id, "cancelled": e.cancelled} for e in session.query(Event).all()]
+async def list_events_debug(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), db: AsyncSession = Depends(get_db)):
+    rows = (await db.execute(DEBUG_EVENTS_STMT.limit(limit).offset(offset))).all()
+    return ORJSONResponse([dict(r._mapping) for r in rows])
 
 @app.get("/debug/students")
-def list_students_debug():
-    with Session() as session:
-        return [{"id": s.id, "name": s.name, "email": s.email, "college_id": s.college_id} for s in session.query(Student).all()]
+async def list_students_debug(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), db: AsyncSession = Depends(get_db)):
+    rows = (await db.execute(DEBUG_STUDENTS_STMT.limit(limit).offset(offset))).all()
+    return ORJSONResponse([dict(r._mapping) for r in rows])
 
 @app.get("/debug/registrations")
-def list_regs_debug():
-    with Session() as session:
-        return [{"id": r.id, "student_id": r.student_id, "event_id": r.event_id, "attended": r.attended, "feedback_rating": r.feedback_rating} for r in session.query(Registration).all()]
\ No newline at end of file
+async def list_regs_debug(limit: Optional[int] = Query(None, ge=1), offset: int = Query(0, ge=0)):
+    return stream_ndjson(DEBUG_REGISTRATIONS_STMT.limit(limit).offset(offset))
\ No newline at end of file